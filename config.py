@@ -3,75 +3,99 @@ Configuration file for Google Drive PDF Downloader.
 Customize these settings to your needs.
 """
 
-# ============================================================================
-# BROWSER SETTINGS
-# ============================================================================
+import warnings
+from dataclasses import dataclass, fields
 
-# Run browser in headless mode (no visible window)
-# Set to True for background processing, False for visible browser
-HEADLESS_MODE = False
 
-# Browser type: 'chromium', 'chrome', 'firefox', 'webkit'
-BROWSER_TYPE = 'chromium'
+@dataclass(frozen=True)
+class Config:
+    """Downloader settings, loaded once and shared by all importers."""
 
-# ============================================================================
-# TIMEOUT SETTINGS
-# ============================================================================
+    # ========================================================================
+    # BROWSER SETTINGS
+    # ========================================================================
 
-# Maximum time to wait for page to load (seconds)
-# Increase this for slow internet connections
-PAGE_LOAD_TIMEOUT = 30
+    # Run browser in headless mode (no visible window)
+    # Set to True for background processing, False for visible browser
+    headless_mode: bool = False
 
-# ============================================================================
-# OUTPUT SETTINGS
-# ============================================================================
+    # Browser type: 'chromium', 'chrome', 'firefox', 'webkit'
+    browser_type: str = 'chromium'
 
-# Directory where PDFs will be saved
-DOWNLOADS_DIRECTORY = 'downloads'
+    # ========================================================================
+    # TIMEOUT SETTINGS
+    # ========================================================================
 
-# Temporary directory for image files
-TEMP_DIRECTORY = 'temp_images'
+    # Maximum time to wait for page to load (seconds)
+    # Increase this for slow internet connections
+    page_load_timeout: int = 30
 
-# ============================================================================
-# LOGGING SETTINGS
-# ============================================================================
+    # ========================================================================
+    # OUTPUT SETTINGS
+    # ========================================================================
 
-# Log file name
-LOG_FILE = 'gdrive_pdf_downloader.log'
+    # Directory where PDFs will be saved
+    downloads_directory: str = 'downloads'
 
-# Log level: 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'
-LOG_LEVEL = 'INFO'
+    # ========================================================================
+    # LOGGING SETTINGS
+    # ========================================================================
 
-# ============================================================================
-# PDF SETTINGS
-# ============================================================================
+    # Log file name
+    log_file: str = 'gdrive_pdf_downloader.log'
 
-# Image quality for JPEG conversion (1-100)
-# Higher = better quality but larger file size
-IMAGE_QUALITY = 95
+    # Log level: 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'
+    log_level: str = 'INFO'
 
-# ============================================================================
-# PROCESSING SETTINGS
-# ============================================================================
+    # ========================================================================
+    # PDF SETTINGS
+    # ========================================================================
 
-# Delay between downloads in seconds (to avoid rate limiting)
-DOWNLOAD_DELAY = 2
+    # Image quality for JPEG conversion (1-100)
+    # Higher = better quality but larger file size
+    image_quality: int = 95
 
-# Maximum number of pages to capture (0 = unlimited)
-MAX_PAGES = 0
+    # ========================================================================
+    # PROCESSING SETTINGS
+    # ========================================================================
 
-# ============================================================================
-# ADVANCED SETTINGS
-# ============================================================================
+    # Maximum number of pages to capture (0 = unlimited)
+    max_pages: int = 0
+
+    # ========================================================================
+    # ADVANCED SETTINGS
+    # ========================================================================
+
+    # Maximum number of retry attempts for page loading
+    max_retries: int = 10
+
+    # Wait time between retry attempts (seconds)
+    retry_delay: int = 2
 
-# Whether to keep temporary image files (for debugging)
-KEEP_TEMP_FILES = False
 
-# Maximum number of retry attempts for page loading
-MAX_RETRIES = 10
+config = Config()
+
+_SETTING_NAMES = frozenset(f.name.upper() for f in fields(Config))
+
+# Settings that no longer affect anything, kept so old imports still work.
+# Pages are held in memory (no temp images) and download pacing is done by
+# the downloader's rate limiter (--max-rate)
+_DEPRECATED_SETTINGS = {
+    'TEMP_DIRECTORY': 'temp_images',
+    'KEEP_TEMP_FILES': False,
+    'DOWNLOAD_DELAY': 2,
+}
+
+
+def __getattr__(name):
+    """Resolve legacy upper-case constants (e.g. HEADLESS_MODE) on access."""
+    if name in _SETTING_NAMES:
+        return getattr(config, name.lower())
+    if name in _DEPRECATED_SETTINGS:
+        warnings.warn(f"config.{name} is deprecated and has no effect", DeprecationWarning, stacklevel=2)
+        return _DEPRECATED_SETTINGS[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Wait time between retry attempts (seconds)
-RETRY_DELAY = 2
 
 # ============================================================================
 # USAGE
@@ -79,9 +103,11 @@ RETRY_DELAY = 2
 
 # To use these settings in your code:
 #
-# from config import HEADLESS_MODE, PAGE_LOAD_TIMEOUT, DOWNLOADS_DIRECTORY
+# from config import config
 #
 # downloader = GoogleDrivePDFDownloader(
-#     headless=HEADLESS_MODE,
-#     timeout=PAGE_LOAD_TIMEOUT
+#     headless=config.headless_mode,
+#     timeout=config.page_load_timeout
 # )
+#
+# The old constant names still work: from config import HEADLESS_MODE
@@ -1,186 +1,357 @@
 """
 Debug script to inspect the DOM structure of a Google Drive folder
 and find the correct selectors for PDF files.
+
+Usage: python debug_folder_dom.py [--first-match] [FOLDER_URL ...]
 """
 
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+import logging
+import sys
 
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
-async def debug_folder_dom():
-    """Inspect the DOM structure of a Google Drive folder."""
-    
-    folder_url = "https://drive.google.com/drive/folders/18t4PrOWpINDDOeBc4clbVXsqDh7tYJ8E"
+from config import config
+
+log = logging.getLogger(__name__)
+
+SEPARATOR = "=" * 60
+
+
+# Selector approaches to try against the folder view, most specific first
+SELECTORS_TO_TEST = (
+    # Original approach
+    'a[href*="/file/d/"]',
+    # Alternative: data attributes
+    '[data-id][data-name]',
+    # Divs with file info
+    '[role="button"][data-id]',
+    # Links in list
+    'a[href*="drive.google.com"]',
+    # All links on page
+    'a',
+)
+
+# Browser profile reused across debug runs
+PROFILE_DIR = '.pw-profile'
+
+# Default folder inspected when no URLs are given on the command line
+DEFAULT_FOLDER_URL = "https://drive.google.com/drive/folders/18t4PrOWpINDDOeBc4clbVXsqDh7tYJ8E"
+
+# Maximum number of folders inspected at the same time
+MAX_CONCURRENT_FOLDERS = 3
+
+# Test every selector in a single round-trip instead of one per selector
+SELECTOR_TEST_SCRIPT = """
+    ({selectors, stopAtMatch}) => {
+        let results = [];
+        for (const sel of selectors) {
+            let elements;
+            try {
+                elements = document.querySelectorAll(sel);
+            } catch (e) {
+                results.push({selector: sel, error: String(e)});
+                continue;
+            }
+            // Only pull sample attributes for small result sets
+            const count = elements.length;
+            const sampleCount = count <= 10 ? Math.min(5, count) : 0;
+            let samples = [];
+            for (let i = 0; i < sampleCount; i++) {
+                const el = elements[i];
+                samples.push({
+                    href: el.href,
+                    text: (el.textContent || '').substring(0, 50),
+                    dataId: el.dataset.id,
+                    dataName: el.dataset.name,
+                });
+            }
+            results.push({selector: sel, count: count, samples: samples});
+
+            // A selector yielding file links is the canonical result
+            if (stopAtMatch) {
+                for (let i = 0, n = Math.min(5, count); i < n; i++) {
+                    if ((elements[i].href || '').includes('/file/d/')) {
+                        return results;
+                    }
+                }
+            }
+        }
+        return results;
+    }
+"""
+
+# Collect the HTML structure, PDF links and item names in one pass
+DOM_SUMMARY_SCRIPT = """
+    () => {
+        // Try to find folder content container
+        let structure = null;
+        let container = document.querySelector('[role="main"]') || 
+                       document.querySelector('[role="region"]') ||
+                       document.querySelector('.a-b-d-b-a');
+
+        if (container) {
+            // Get first few items
+            let items = container.querySelectorAll('[role="button"], a, [data-id]');
+            structure = [];
+            for (let i = 0, n = Math.min(5, items.length); i < n; i++) {
+                const item = items[i];
+                structure.push({
+                    html: item.outerHTML.slice(0, 200),
+                    tagName: item.tagName,
+                    className: item.className,
+                    childCount: item.childElementCount,
+                    attrs: {
+                        href: item.href,
+                        'data-id': item.dataset.id,
+                        'data-name': item.dataset.name,
+                        'data-type': item.dataset.type,
+                        role: item.getAttribute('role'),
+                        tabindex: item.getAttribute('tabindex'),
+                    }
+                });
+            }
+        }
+
+        // Links with /file/d/ in href or 'pdf' in text
+        let pdfLinks = [];
+        let anchors = document.querySelectorAll('a');
+        for (let i = 0, n = anchors.length; i < n; i++) {
+            const a = anchors[i];
+            const href = a.href || '';
+            const text = a.textContent || '';
+            if (href.includes('/file/d/') || text.toLowerCase().includes('pdf')) {
+                pdfLinks.push({
+                    href: href,
+                    text: text.substring(0, 100)
+                });
+            }
+        }
+
+        // File/folder names from data attributes and buttons, in one walk
+        let dataNames = [];
+        let buttonNames = [];
+        let elements = document.querySelectorAll('[data-id], [role="button"]');
+        for (let i = 0, n = elements.length; i < n; i++) {
+            const el = elements[i];
+            const dataset = el.dataset;
+            const isData = dataset.id !== undefined;
+            const dataName = isData ? dataset.name : null;
+            const isButton = el.getAttribute('role') === 'button';
+            // Only read textContent (potentially large) when it is used
+            const raw = (isButton || (isData && !dataName)) ? el.textContent : null;
+            if (isData) {
+                dataNames.push((dataName || raw || '').substring(0, 100));
+            }
+            if (isButton && raw && raw.length < 200) {
+                buttonNames.push(raw.substring(0, 100));
+            }
+        }
+
+        // Dedupe and cap here so only the printed names cross the wire
+        const seen = new Set();
+        const items = [];
+        const addUnique = (source, names) => {
+            for (let i = 0, n = names.length; i < n && items.length < 20; i++) {
+                const name = names[i];
+                if (!seen.has(name)) {
+                    seen.add(name);
+                    items.push({source: source, name: name});
+                }
+            }
+        };
+        addUnique('data-id', dataNames);
+        addUnique('button', buttonNames);
+
+        return {
+            structure: structure,
+            pdfLinks: pdfLinks,
+            items: items,
+            itemCount: dataNames.length + buttonNames.length,
+        };
+    }
+"""
+
+# Resource types that don't affect the DOM we inspect
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+
+
+async def block_heavy_resources(route):
+    """Abort requests for resources irrelevant to DOM inspection."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def inspect_folder(context, folder_url: str, stop_at_first_match: bool = False) -> dict:
+    """
+    Load a folder in a new page and collect its DOM inspection results.
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # Visible so you can see
-        page = await browser.new_page()
+    Args:
+        context: Playwright browser context to open the page in
+        folder_url: Google Drive folder URL
+        stop_at_first_match: Stop testing selectors once one finds /file/d/ links
         
-        print("Opening folder...")
+    Returns:
+        Dict with the raw selector results and DOM summary (or error messages)
+    """
+    data = {'selector_results': None, 'selector_error': None, 'summary': None, 'summary_error': None}
+    page = await context.new_page()
+    
+    try:
+        log.info("Opening folder: %s", folder_url)
         await page.goto(folder_url, wait_until='networkidle', timeout=60000)
         
-        print("Waiting for folder content to load...")
-        await asyncio.sleep(5)
-        
-        # Try multiple selector approaches
-        selectors_to_test = [
-            # Original approach
-            'a[href*="/file/d/"]',
-            # Alternative: data attributes
-            '[data-id][data-name]',
-            # Links in list
-            'a[href*="drive.google.com"]',
-            # Divs with file info
-            '[role="button"][data-id]',
-            # All links on page
-            'a',
-        ]
-        
-        print("\n" + "="*60)
-        print("Testing different selectors:")
-        print("="*60)
-        
-        for selector in selectors_to_test:
-            try:
-                elements = await page.query_selector_all(selector)
-                print(f"\nSelector: {selector}")
-                print(f"  Found: {len(elements)} elements")
-                
-                if len(elements) > 0 and len(elements) <= 10:
-                    for i, elem in enumerate(elements[:5]):
-                        href = await elem.get_attribute('href')
-                        text = await elem.text_content()
-                        data_id = await elem.get_attribute('data-id')
-                        data_name = await elem.get_attribute('data-name')
-                        
-                        print(f"    [{i}] href={href}, text={text[:50] if text else 'N/A'}, data-id={data_id}, data-name={data_name}")
-            except Exception as e:
-                print(f"\nSelector: {selector} - Error: {e}")
-        
-        # Get full HTML of first few items to understand structure
-        print("\n" + "="*60)
-        print("Full HTML structure of first item:")
-        print("="*60)
+        try:
+            await page.wait_for_selector('[data-id], a[href*="/file/d/"]', timeout=15000)
+        except PlaywrightTimeoutError:
+            log.warning("No folder items appeared within 15s, inspecting page as-is: %s", folder_url)
         
         try:
-            # Try to get the inner HTML of the folder contents area
-            html = await page.evaluate("""
-                () => {
-                    // Try to find folder content container
-                    let container = document.querySelector('[role="main"]') || 
-                                   document.querySelector('[role="region"]') ||
-                                   document.querySelector('.a-b-d-b-a');
-                    
-                    if (container) {
-                        // Get first few items
-                        let items = container.querySelectorAll('[role="button"], a, [data-id]');
-                        let result = [];
-                        for (let i = 0; i < Math.min(5, items.length); i++) {
-                            result.push({
-                                html: items[i].outerHTML,
-                                tagName: items[i].tagName,
-                                className: items[i].className,
-                                attrs: {
-                                    href: items[i].getAttribute('href'),
-                                    'data-id': items[i].getAttribute('data-id'),
-                                    'data-name': items[i].getAttribute('data-name'),
-                                    'data-type': items[i].getAttribute('data-type'),
-                                    role: items[i].getAttribute('role'),
-                                    tabindex: items[i].getAttribute('tabindex'),
-                                }
-                            });
-                        }
-                        return result;
-                    }
-                    return null;
-                }
-            """)
-            
-            if html:
-                for i, item in enumerate(html):
-                    print(f"\nItem {i}:")
-                    print(f"  Tag: {item['tagName']}")
-                    print(f"  Class: {item['className']}")
-                    print(f"  Attributes: {item['attrs']}")
-                    print(f"  HTML (first 200 chars): {item['html'][:200]}")
+            data['selector_results'] = await page.evaluate(
+                SELECTOR_TEST_SCRIPT,
+                {'selectors': list(SELECTORS_TO_TEST), 'stopAtMatch': stop_at_first_match}
+            )
         except Exception as e:
-            print(f"Error extracting HTML: {e}")
-        
-        # Get all links with PDF in name
-        print("\n" + "="*60)
-        print("All links containing 'pdf' or with /file/d/ in href:")
-        print("="*60)
+            data['selector_error'] = e
         
         try:
-            pdf_links = await page.evaluate("""
-                () => {
-                    let links = [];
-                    let anchors = document.querySelectorAll('a');
-                    for (let a of anchors) {
-                        let href = a.href || '';
-                        let text = a.textContent || '';
-                        if (href.includes('/file/d/') || text.toLowerCase().includes('pdf')) {
-                            links.push({
-                                href: href,
-                                text: text.substring(0, 100)
-                            });
-                        }
-                    }
-                    return links;
-                }
-            """)
-            
-            print(f"Found {len(pdf_links)} PDF links")
-            for link in pdf_links[:10]:
-                print(f"  href: {link['href']}")
-                print(f"  text: {link['text']}")
-                print()
+            data['summary'] = await page.evaluate(DOM_SUMMARY_SCRIPT)
         except Exception as e:
-            print(f"Error: {e}")
-        
-        # Try to list all visible text in the folder
-        print("\n" + "="*60)
-        print("All visible item names in folder:")
-        print("="*60)
+            data['summary_error'] = e
+    except Exception as e:
+        data['selector_error'] = data['summary_error'] = e
+    finally:
+        await page.close()
+    
+    return data
+
+
+def report_folder(folder_url: str, data: dict) -> None:
+    """Log the inspection results collected by inspect_folder."""
+    log.info("\n%s", SEPARATOR)
+    log.info("Folder: %s", folder_url)
+    log.info(SEPARATOR)
+    
+    log.info("\n%s", SEPARATOR)
+    log.info("Testing different selectors:")
+    log.info(SEPARATOR)
+    
+    selector_results = data['selector_results']
+    if selector_results is None:
+        log.error("\nError testing selectors: %s", data['selector_error'])
+    else:
+        for result in selector_results:
+            if 'error' in result:
+                log.error("\nSelector: %s - Error: %s", result['selector'], result['error'])
+                continue
+            log.info("\nSelector: %s", result['selector'])
+            log.info("  Found: %d elements", result['count'])
+
+            for i, sample in enumerate(result['samples']):
+                log.info("    [%d] href=%s, text=%s, data-id=%s, data-name=%s",
+                         i, sample['href'], sample['text'] or 'N/A', sample['dataId'], sample['dataName'])
+
+        skipped = len(SELECTORS_TO_TEST) - len(selector_results)
+        if skipped:
+            log.info("\nStopped at first matching selector, skipped %d more", skipped)
+    
+    summary = data['summary']
+    if summary is None:
+        log.error("Error inspecting folder DOM: %s", data['summary_error'])
+        html, pdf_links, items, item_count = None, [], [], 0
+    else:
+        html, pdf_links, items = summary['structure'], summary['pdfLinks'], summary['items']
+        item_count = summary['itemCount']
+    
+    # Get full HTML of first few items to understand structure
+    log.info("\n%s", SEPARATOR)
+    log.info("Full HTML structure of first item:")
+    log.info(SEPARATOR)
+    
+    if html:
+        for i, item in enumerate(html):
+            log.info("\nItem %d:", i)
+            log.info("  Tag: %s", item['tagName'])
+            log.info("  Class: %s", item['className'])
+            log.info("  Attributes: %s", item['attrs'])
+            log.info("  Children: %d", item['childCount'])
+            log.info("  HTML (first 200 chars): %s", item['html'])
+    
+    # Get all links with PDF in name
+    log.info("\n%s", SEPARATOR)
+    log.info("All links containing 'pdf' or with /file/d/ in href:")
+    log.info(SEPARATOR)
+    
+    log.info("Found %d PDF links", len(pdf_links))
+    for link in pdf_links[:10]:
+        log.info("  href: %s", link['href'])
+        log.info("  text: %s", link['text'])
+        log.info("")
+    
+    # Try to list all visible text in the folder
+    log.info("\n%s", SEPARATOR)
+    log.info("All visible item names in folder:")
+    log.info(SEPARATOR)
+    
+    log.info("Found %d items", item_count)
+    for item in items:
+        log.info("  [%s] %s", item['source'], item['name'])
+
+
+async def debug_folder_dom(folder_urls=(DEFAULT_FOLDER_URL,), stop_at_first_match: bool = False):
+    """
+    Inspect the DOM structure of one or more Google Drive folders.
+    
+    All folders share one browser; up to MAX_CONCURRENT_FOLDERS load at once
+    and results are reported in the order the URLs were given.
+    
+    Args:
+        folder_urls: Google Drive folder URLs to inspect
+        stop_at_first_match: Stop testing selectors once one finds /file/d/ links
+    """
+    async with async_playwright() as p:
+        # Start the browser launching in the background while we report progress.
+        # A persistent profile keeps cookies and HTTP cache warm between runs.
+        context_task = asyncio.create_task(
+            p.chromium.launch_persistent_context(PROFILE_DIR, headless=False)  # Visible so you can see
+        )
+        log.info("Inspecting %d folder(s)", len(folder_urls))
+        log.info("Selectors to test: %d", len(SELECTORS_TO_TEST))
+        context = await context_task
         
         try:
-            items = await page.evaluate("""
-                () => {
-                    // Look for file/folder names in various possible locations
-                    let items = [];
-                    
-                    // Method 1: Look for elements with data attributes
-                    let elements = document.querySelectorAll('[data-id]');
-                    for (let el of elements) {
-                        let name = el.getAttribute('data-name') || el.textContent || '';
-                        items.push({source: 'data-id', name: name.substring(0, 100)});
-                    }
-                    
-                    // Method 2: Look for buttons with file names
-                    let buttons = document.querySelectorAll('[role="button"]');
-                    for (let btn of buttons) {
-                        let text = btn.textContent || '';
-                        if (text.length > 0 && text.length < 200) {
-                            items.push({source: 'button', name: text.substring(0, 100)});
-                        }
-                    }
-                    
-                    return items;
-                }
-            """)
+            await context.route('**/*', block_heavy_resources)
             
-            print(f"Found {len(items)} items")
-            seen = set()
-            for item in items[:20]:
-                if item['name'] not in seen:
-                    print(f"  [{item['source']}] {item['name']}")
-                    seen.add(item['name'])
-        except Exception as e:
-            print(f"Error: {e}")
-        
-        await page.close()
-        await browser.close()
+            sem = asyncio.Semaphore(MAX_CONCURRENT_FOLDERS)
+            
+            async def inspect_bounded(folder_url):
+                async with sem:
+                    return await inspect_folder(context, folder_url, stop_at_first_match)
+            
+            tasks = [asyncio.create_task(inspect_bounded(url)) for url in folder_urls]
+            for folder_url, task in zip(folder_urls, tasks):
+                report_folder(folder_url, await task)
+        finally:
+            await context.close()
 
 
 if __name__ == '__main__':
-    asyncio.run(debug_folder_dom())
+    logging.basicConfig(
+        level=config.log_level,
+        format='%(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler(config.log_file, encoding='utf-8')
+        ]
+    )
+    parser = argparse.ArgumentParser(description='Inspect the DOM of Google Drive folder pages')
+    parser.add_argument('folder_urls', nargs='*', default=[DEFAULT_FOLDER_URL],
+                        help='Folder URLs to inspect (default: a sample folder)')
+    parser.add_argument('--first-match', action='store_true',
+                        help='Stop testing selectors once one finds /file/d/ links')
+    args = parser.parse_args()
+
+    asyncio.run(debug_folder_dom(args.folder_urls, stop_at_first_match=args.first_match))
@@ -7,20 +7,26 @@ Captures PDF pages as images and compiles them into a single PDF.
 import argparse
 import asyncio
 import csv
+import io
 import logging
 import os
 import re
 import sys
 import time
 import base64
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import AsyncExitStack
 from datetime import datetime
+from http.cookies import SimpleCookie
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
 from PIL import Image
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import (async_playwright, Browser, BrowserContext, Page, Playwright,
+                                  TimeoutError as PlaywrightTimeoutError)
 import img2pdf
 
 # Configure logging
@@ -35,31 +41,189 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for filename sanitizing and Drive URL parsing
+ILLEGAL_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+FILE_ID_RE = re.compile(r'(?:/file/d/|/open\?id=)([a-zA-Z0-9-_]+)')
+OPEN_URL_RE = re.compile(r'/open\?id=')
+FOLDER_ID_RE = re.compile(r'/drive/(?:u/\d+/)?folders/([a-zA-Z0-9-_]+)')
+DRIVE_URL_RE = re.compile(
+    r'^https?://(?:www\.)?drive\.google\.com/'
+    r'(?:file/d/[^/]+|drive/(?:u/\d+/)?folders/[^/]+|open\?id=[^&]+)'
+)
+
+# Folder-scan routine, installed once per page as an init script so the
+# repeated scan calls only ship a tiny function reference
+FOLDER_SCAN_SCRIPT = """
+    window.__gddScanFolderFiles = () => {
+        let files = [];
+        
+        // Look for all rows with data-id attributes (files/folders in the list)
+        let rows = document.querySelectorAll('[data-id][role="row"], tr[data-id]');
+        for (let row of rows) {
+            let fileId = row.getAttribute('data-id');
+            if (!fileId) continue;
+            
+            // Try to find the name within the row
+            let nameElem = row.querySelector('[data-tooltip]') || row.querySelector('.a65Cwf') || row;
+            let name = '';
+            
+            if (nameElem && nameElem.getAttribute('data-tooltip')) {
+                name = nameElem.getAttribute('data-tooltip');
+            } else {
+                name = nameElem ? (nameElem.textContent || '') : '';
+            }
+            
+            // Only include PDFs (check by name ending with .pdf or containing PDF type indicator)
+            if (name.toLowerCase().includes('.pdf') || 
+                row.textContent.toLowerCase().includes('pdf')) {
+                files.push({
+                    id: fileId,
+                    name: name.trim()
+                });
+            }
+        }
+        
+        return files;
+    };
+"""
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# IHDR colour types without an alpha channel or palette (greyscale, RGB)
+PNG_OPAQUE_COLOR_TYPES = (0, 2)
+
+
+def png_is_opaque(img_data: bytes) -> bool:
+    """Check the PNG header for a colour type img2pdf can embed as-is."""
+    # Byte 25 is the colour type field of the IHDR chunk
+    return (len(img_data) > 25 and img_data.startswith(PNG_SIGNATURE)
+            and img_data[25] in PNG_OPAQUE_COLOR_TYPES)
+
+
+def transcode_page_image(img_data: bytes) -> bytes:
+    """
+    Prepare a captured page image for img2pdf.
+
+    Images with transparency (or a palette) are flattened onto white and
+    re-encoded as JPEG, since img2pdf rejects alpha channels. Other images
+    are returned unchanged.
+    """
+    # Drive's rendered pages are usually opaque PNGs; skip PIL entirely for them
+    if png_is_opaque(img_data):
+        return img_data
+
+    img = Image.open(io.BytesIO(img_data))
+    if img.mode not in ('RGBA', 'LA', 'P'):
+        return img_data
+
+    # Flatten onto white; compositing uses the alpha band in place instead of
+    # splitting the image into per-channel copies
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+    rgb_img = Image.alpha_composite(background, img).convert('RGB')
+    buffer = io.BytesIO()
+    rgb_img.save(buffer, 'JPEG', quality=95)
+    return buffer.getvalue()
+
+
+def compile_pdf_worker(pdf_images: List[bytes], output_path: str) -> None:
+    """Compile prepared page images into a PDF file (runs in a worker process)."""
+    Path(output_path).write_bytes(img2pdf.convert(pdf_images))
+
+
+class AsyncRateLimiter:
+    """Token-bucket limiter: allows ``max_rate`` acquisitions per ``time_period`` seconds on average.
+
+    Bursts of up to ``max(1, max_rate)`` go through immediately; after that
+    callers wait just long enough for a token to refill instead of sleeping a
+    fixed delay. Fractional rates work, e.g. 0.5 allows one every two seconds.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        self.max_rate = max_rate
+        self.time_period = time_period
+        # Burst size; at least one token so rates below 1 can still acquire
+        self.capacity = max(1.0, max_rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        # Created on first use so the lock binds to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last_refill) * self.max_rate / self.time_period)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
 
 class GoogleDrivePDFDownloader:
     """Downloads PDFs from Google Drive links using browser automation."""
 
-    def __init__(self, headless: bool = False, timeout: int = 30):
+    # Number of blob pages fetched from the viewer per browser round-trip
+    PAGE_FETCH_BATCH_SIZE = 8
+
+    # Safety cap on pages discovered per document, to avoid infinite loops
+    MAX_PAGES_CAP = 200
+
+    # Page discovery stops after this many scroll rounds with no new pages
+    DISCOVERY_STABLE_ROUNDS = 8
+
+    # Pause between discovery scroll rounds (milliseconds)
+    DISCOVERY_SCROLL_DELAY_MS = 400
+
+    # Cookies and local storage saved after each batch and restored in the
+    # next one, so later runs skip Drive's consent and sign-in pages
+    STORAGE_STATE_FILE = Path("gdrive_state.json")
+
+    def __init__(self, headless: bool = False, timeout: int = 30, concurrency: int = 4,
+                 max_rate: float = 8.0):
         """
         Initialize the downloader.
         
         Args:
             headless: Whether to run browser in headless mode
             timeout: Maximum time to wait for page load (seconds)
+            concurrency: Maximum number of PDFs rendered in the browser at the same time
+            max_rate: Maximum number of downloads started per second
         """
         self.headless = headless
         self.timeout = timeout * 1000  # Convert to milliseconds for Playwright
+        self.concurrency = max(1, concurrency)
+        self.max_rate = max_rate
+        self._reserved_paths = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_headless = headless
         self.downloads_dir = Path("downloads")
         self.downloads_dir.mkdir(exist_ok=True)
-        self.temp_dir = Path("temp_images")
-        self.temp_dir.mkdir(exist_ok=True)
         logger.info(f"Output directory: {self.downloads_dir.absolute()}")
 
     def sanitize_filename(self, filename: str) -> str:
         """Remove illegal characters from filename."""
         # Remove invalid characters
-        illegal_chars = r'[<>:"/\\|?*\x00-\x1f]'
-        sanitized = re.sub(illegal_chars, '_', filename)
+        sanitized = ILLEGAL_FILENAME_CHARS_RE.sub('_', filename)
         # Remove trailing dots and spaces
         sanitized = sanitized.rstrip('. ')
         # Limit length
@@ -74,8 +238,10 @@ class GoogleDrivePDFDownloader:
         Supports formats:
         - https://drive.google.com/file/d/FILE_ID/view
         - https://drive.google.com/file/d/FILE_ID/view?usp=sharing
+        - https://drive.google.com/open?id=FILE_ID (may also be a folder;
+          see resolve_open_url)
         """
-        match = re.search(r'/file/d/([a-zA-Z0-9-_]+)/', url)
+        match = FILE_ID_RE.search(url)
         if match:
             return match.group(1)
         return None
@@ -87,55 +253,101 @@ class GoogleDrivePDFDownloader:
         Supports formats:
         - https://drive.google.com/drive/folders/FOLDER_ID
         - https://drive.google.com/drive/folders/FOLDER_ID?usp=sharing
+        - https://drive.google.com/drive/u/0/folders/FOLDER_ID
         """
-        match = re.search(r'/drive/folders/([a-zA-Z0-9-_]+)', url)
+        match = FOLDER_ID_RE.search(url)
         if match:
             return match.group(1)
         return None
 
     def is_folder_url(self, url: str) -> bool:
         """Check if URL is a Google Drive folder URL."""
-        return '/drive/folders/' in url
+        return FOLDER_ID_RE.search(url) is not None
 
     def is_file_url(self, url: str) -> bool:
         """Check if URL is a Google Drive file URL."""
         return '/file/d/' in url
 
-    async def wait_for_pdf_pages(self, page: Page, max_retries: int = 10) -> bool:
+    def is_open_url(self, url: str) -> bool:
+        """Check if URL is an open?id= link, which can point at a file or a folder."""
+        return OPEN_URL_RE.search(url) is not None
+
+    async def resolve_open_url(self, url: str, context: BrowserContext) -> str:
+        """
+        Follow an open?id= link to the file or folder page it redirects to.
+        
+        Returns the original URL if Drive doesn't land on a file or folder page
+        (e.g. a sign-in page), so it is then tried as a file.
+        """
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+            resolved = page.url
+        except Exception as e:
+            logger.debug(f"Could not resolve {url}: {e}")
+            return url
+        finally:
+            await self._close_page(page)
+        if self.is_folder_url(resolved) or self.is_file_url(resolved):
+            logger.info(f"Resolved {url} -> {resolved}")
+            return resolved
+        return url
+
+    async def wait_for_pdf_pages(self, page: Page, timeout: int = 20000) -> bool:
         """
         Wait for PDF pages (blob images) to load in Google Drive viewer.
         
-        Detects blob images that start with 'blob:https://drive.google.com/'
+        Detects blob images that start with 'blob:https://drive.google.com/'.
+        A MutationObserver in the page resolves as soon as the first one is
+        inserted, so no polling round-trips are needed.
+        
+        Args:
+            page: Page showing the Google Drive viewer
+            timeout: Maximum time to wait for the first page (milliseconds)
         """
         logger.info("Waiting for PDF pages to load...")
         
-        for attempt in range(max_retries):
-            try:
-                # Wait for images to load
-                await page.wait_for_load_state('networkidle', timeout=5000)
-            except Exception as e:
-                logger.debug(f"Network idle wait timeout (attempt {attempt + 1}): {e}")
-
-            # Check if blob images are present
-            blob_images_count = await page.evaluate("""
-                () => {
+        blob_images_count = await page.evaluate("""
+            (timeout) => new Promise((resolve) => {
+                const count = () => {
                     let imgs = document.getElementsByTagName('img');
-                    let count = 0;
+                    let n = 0;
                     for (let i = 0; i < imgs.length; i++) {
                         if (imgs[i].src.startsWith('blob:https://drive.google.com/')) {
-                            count++;
+                            n++;
                         }
                     }
-                    return count;
+                    return n;
+                };
+                let found = count();
+                if (found > 0) {
+                    resolve(found);
+                    return;
                 }
-            """)
-
-            if blob_images_count > 0:
-                logger.info(f"Found {blob_images_count} PDF pages")
-                return True
-
-            logger.debug(f"Attempt {attempt + 1}/{max_retries}: Found {blob_images_count} pages, waiting...")
-            await asyncio.sleep(2)
+                const observer = new MutationObserver(() => {
+                    let n = count();
+                    if (n > 0) {
+                        observer.disconnect();
+                        clearTimeout(timer);
+                        resolve(n);
+                    }
+                });
+                const timer = setTimeout(() => {
+                    observer.disconnect();
+                    resolve(0);
+                }, timeout);
+                observer.observe(document, {
+                    subtree: true,
+                    childList: true,
+                    attributes: true,
+                    attributeFilter: ['src']
+                });
+            })
+        """, timeout)
+
+        if blob_images_count > 0:
+            logger.info(f"Found {blob_images_count} PDF pages")
+            return True
 
         logger.warning("Could not detect PDF pages")
         return False
@@ -163,153 +375,159 @@ class GoogleDrivePDFDownloader:
         
         Returns list of image data (bytes) for each page.
         """
+        return [img_data async for _, img_data in self.iter_blob_images(page)]
+
+    async def iter_blob_images(self, page: Page) -> AsyncIterator[Tuple[int, bytes]]:
+        """
+        Capture blob images (PDF pages) from Google Drive viewer as they arrive.
+        
+        Yields (page_number, image_data) for each captured page, batch by batch,
+        so callers can process early pages while later ones are still fetched.
+        """
         logger.info("Capturing PDF pages as images (will scroll to load all pages)...")
 
-        image_data_list: List[bytes] = []
+        captured = 0
 
         try:
-            collected_urls: List[str] = []
-
-            # Try to discover all blob URLs by scrolling the viewer.
-            max_scroll_attempts = 8
-            no_new_count = 0
-            max_pages_cap = 200  # safety cap to avoid infinite loops
-
+            # Discover all blob URLs by scrolling the viewer. The whole loop runs
+            # inside the page, so each scroll step costs no CDP round-trip.
             logger.debug("Beginning scroll/discovery loop for blob images")
-            for attempt in range(0, 1000):
-                # Get current blob image URLs in DOM order
-                urls = await page.evaluate("""
-                    () => {
+            discovery = await page.evaluate("""
+                async ({maxStableRounds, maxPages, delay}) => {
+                    // blob URL -> page index, in DOM order
+                    const seen = new Map();
+                    let stable = 0;
+                    for (let attempt = 0; attempt < 1000; attempt++) {
+                        // Collect current blob image URLs in DOM order and tag each
+                        // image with its page index so the canvas fallback can look
+                        // it up directly
                         let imgs = document.getElementsByTagName('img');
-                        let urls = [];
+                        let before = seen.size;
                         for (let i = 0; i < imgs.length; i++) {
                             let src = imgs[i].src || '';
                             if (src.startsWith('blob:https://drive.google.com/')) {
-                                urls.push(src);
+                                if (!seen.has(src)) seen.set(src, seen.size);
+                                imgs[i].dataset.gddIdx = seen.get(src);
                             }
                         }
-                        return urls;
-                    }
-                """)
 
-                added = 0
-                for u in urls:
-                    if u not in collected_urls:
-                        collected_urls.append(u)
-                        added += 1
+                        // If we've hit a reasonable page cap, stop
+                        if (seen.size >= maxPages) {
+                            return {urls: [...seen.keys()].slice(0, maxPages), capped: true, attempts: attempt + 1};
+                        }
 
-                logger.debug(f"Discovery attempt {attempt}: found {len(urls)} urls, total collected {len(collected_urls)} (added {added})")
+                        // If we've seen no new URLs for a few rounds, assume all loaded
+                        stable = seen.size === before ? stable + 1 : 0;
+                        if (stable >= maxStableRounds) {
+                            return {urls: [...seen.keys()], capped: false, attempts: attempt + 1};
+                        }
 
-                # If we've hit a reasonable page cap, stop
-                if len(collected_urls) >= max_pages_cap:
-                    logger.warning(f"Reached max page cap ({max_pages_cap}), stopping discovery")
-                    break
+                        // Scroll the last image into view to trigger lazy-loading
+                        if (imgs.length > 0) {
+                            imgs[imgs.length - 1].scrollIntoView({behavior: 'auto', block: 'center'});
+                        } else {
+                            window.scrollBy(0, window.innerHeight);
+                        }
 
-                if added == 0:
-                    no_new_count += 1
-                else:
-                    no_new_count = 0
+                        // Wait briefly for new pages to load
+                        await new Promise((resolve) => setTimeout(resolve, delay));
+                    }
+                    return {urls: [...seen.keys()], capped: false, attempts: 1000};
+                }
+            """, {
+                'maxStableRounds': self.DISCOVERY_STABLE_ROUNDS,
+                'maxPages': self.MAX_PAGES_CAP,
+                'delay': self.DISCOVERY_SCROLL_DELAY_MS,
+            })
 
-                # If we've seen no new URLs for a few iterations, assume all loaded
-                if no_new_count >= max_scroll_attempts:
-                    logger.debug("No new URLs detected after multiple attempts, finishing discovery")
-                    break
+            collected_urls: List[str] = discovery['urls']
+            logger.debug(f"Discovery finished after {discovery['attempts']} scroll rounds")
+            if discovery['capped']:
+                logger.warning(f"Reached max page cap ({self.MAX_PAGES_CAP}), stopping discovery")
 
-                # Scroll the last image into view to trigger lazy-loading
-                try:
-                    await page.evaluate("""
-                        () => {
-                            let imgs = document.getElementsByTagName('img');
-                            if (imgs.length > 0) {
-                                imgs[imgs.length - 1].scrollIntoView({behavior: 'auto', block: 'center'});
-                            } else {
-                                window.scrollBy(0, window.innerHeight);
-                            }
-                        }
-                    """)
-                except Exception:
-                    # Fallback: page keyboard page down
-                    try:
-                        await page.keyboard.press('PageDown')
-                    except Exception:
-                        pass
+            logger.info(f"Found {len(collected_urls)} blob image URLs after discovery")
 
-                # Wait briefly for new pages to load
-                await asyncio.sleep(1.0)
+            # Now download the collected blob URLs in batches; each batch is a
+            # single evaluate whose fetches run in parallel inside the browser
+            total = len(collected_urls)
+            batch_size = self.PAGE_FETCH_BATCH_SIZE
 
-            logger.info(f"Found {len(collected_urls)} blob image URLs after discovery")
+            for start in range(0, total, batch_size):
+                batch_urls = collected_urls[start:start + batch_size]
+                first_idx = start + 1
+                logger.info(f"Capturing pages {first_idx}-{start + len(batch_urls)}/{total}...")
 
-            # Now attempt to download each collected blob URL in order
-            for idx, blob_url in enumerate(collected_urls, 1):
+                # Primary: fetch blobs via page context (null for pages that fail)
                 try:
-                    logger.info(f"Capturing page {idx}/{len(collected_urls)}...")
-
-                    # Primary: fetch blob via page context
+                    images_b64 = await page.evaluate("""
+                        async (urls) => Promise.all(urls.map(async (url) => {
+                            try {
+                                let response = await fetch(url, { headers: { 'Accept': 'image/*' } });
+                                if (!response.ok) throw new Error('HTTP ' + response.status);
+                                let blob = await response.blob();
+                                let bytes = new Uint8Array(await blob.arrayBuffer());
+                                // Base64 keeps the payload ~1.3x the image size; convert
+                                // in slices to stay under the argument-count limit
+                                let binary = '';
+                                for (let i = 0; i < bytes.length; i += 0x8000) {
+                                    binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+                                }
+                                return btoa(binary);
+                            } catch (e) {
+                                console.error('Fetch error:', e);
+                                return null;
+                            }
+                        }))
+                    """, batch_urls)
+                except Exception as fetch_error:
+                    logger.debug("Batch fetch failed for pages starting at %d: %s", first_idx, fetch_error)
+                    images_b64 = [None] * len(batch_urls)
+
+                # Fallback: render the failed pages to canvas and read base64
+                failed = [i for i, img_b64 in enumerate(images_b64) if img_b64 is None]
+                fallback = {}
+                if failed:
+                    logger.debug("Fetch failed for %d page(s), attempting canvas fallback", len(failed))
                     try:
-                        image_buffer = await page.evaluate("""
-                            async (url) => {{
-                                try {{
-                                    let response = await fetch(url, {{ headers: {{ 'Accept': 'image/*' }} }});
-                                    if (!response.ok) throw new Error('HTTP ' + response.status);
-                                    let blob = await response.blob();
-                                    let arrayBuffer = await blob.arrayBuffer();
-                                    return Array.from(new Uint8Array(arrayBuffer));
-                                }} catch (e) {{
-                                    console.error('Fetch error:', e);
-                                    throw e;
-                                }}
-                            }}
-                        """, blob_url)
-
-                        image_data_list.append(bytes(image_buffer))
-                        logger.debug(f"Successfully captured page {idx} via fetch")
-
-                    except Exception as fetch_error:
-                        logger.debug(f"Fetch failed for page {idx}, attempting canvas fallback: {fetch_error}")
-                        # Fallback: render image to canvas and read base64
-                        try:
-                            img_b64 = await page.evaluate("""
-                                (url) => {
-                                    let imgs = document.getElementsByTagName('img');
-                                    for (let img of imgs) {
-                                        if (img.src === url) {
-                                            let canvas = document.createElement('canvas');
-                                            canvas.width = img.naturalWidth || img.width || 1000;
-                                            canvas.height = img.naturalHeight || img.height || 1000;
-                                            let ctx = canvas.getContext('2d');
-                                            try {
-                                                ctx.drawImage(img, 0, 0);
-                                            } catch (e) {
-                                                return null;
-                                            }
-                                            return canvas.toDataURL('image/png').split(',')[1];
-                                        }
-                                    }
+                        fallback_b64 = await page.evaluate("""
+                            (pages) => pages.map(([idx, url]) => {
+                                // Images were tagged with their page index during discovery;
+                                // skip the tag if the viewer has since reused the element
+                                let img = document.querySelector('img[data-gdd-idx="' + idx + '"]');
+                                if (!img || img.src !== url) return null;
+                                let canvas = document.createElement('canvas');
+                                canvas.width = img.naturalWidth || img.width || 1000;
+                                canvas.height = img.naturalHeight || img.height || 1000;
+                                let ctx = canvas.getContext('2d');
+                                try {
+                                    ctx.drawImage(img, 0, 0);
+                                } catch (e) {
                                     return null;
                                 }
-                            """, blob_url)
-
-                            if img_b64:
-                                image_buffer = base64.b64decode(img_b64)
-                                image_data_list.append(image_buffer)
-                                logger.debug(f"Successfully captured page {idx} via canvas fallback")
-                            else:
-                                logger.warning(f"Canvas fallback returned no data for page {idx}")
-
-                        except Exception as canvas_err:
-                            logger.warning(f"Canvas fallback failed for page {idx}: {canvas_err}")
-                            continue
-
-                except Exception as e:
-                    logger.warning(f"Failed to capture page {idx}: {e}")
-                    continue
+                                return canvas.toDataURL('image/png').split(',')[1];
+                            })
+                        """, [[start + i, batch_urls[i]] for i in failed])
+                        fallback = dict(zip(failed, fallback_b64))
+                    except Exception as canvas_err:
+                        logger.warning(f"Canvas fallback failed for pages starting at {first_idx}: {canvas_err}")
+
+                for i, img_b64 in enumerate(images_b64):
+                    idx = first_idx + i
+                    if img_b64 is not None:
+                        logger.debug("Successfully captured page %d via fetch", idx)
+                    elif fallback.get(i):
+                        img_b64 = fallback[i]
+                        logger.debug("Successfully captured page %d via canvas fallback", idx)
+                    else:
+                        logger.warning(f"Failed to capture page {idx}")
+                        continue
+                    captured += 1
+                    yield idx, base64.b64decode(img_b64)
 
-            logger.info(f"Successfully captured {len(image_data_list)} pages")
-            return image_data_list
+            logger.info(f"Successfully captured {captured} pages")
 
         except Exception as e:
             logger.error(f"Error capturing blob images: {e}")
-            return []
 
     async def compile_pdf(self, image_data_list: List[bytes], output_path: Path) -> bool:
         """
@@ -322,49 +540,64 @@ class GoogleDrivePDFDownloader:
         Returns:
             True if successful, False otherwise
         """
-        if not image_data_list:
+        loop = asyncio.get_running_loop()
+        pending = [
+            (idx, img_data, self._schedule_transcode(loop, img_data))
+            for idx, img_data in enumerate(image_data_list, 1)
+        ]
+        return await self._compile_transcoded(pending, output_path)
+
+    def _schedule_transcode(self, loop: asyncio.AbstractEventLoop, img_data: bytes) -> asyncio.Future:
+        """
+        Start converting a page image for img2pdf on a worker thread.
+        
+        PIL's codecs release the GIL, so pages are transcoded in parallel.
+        """
+        return loop.run_in_executor(None, transcode_page_image, img_data)
+
+    async def _compile_transcoded(self, pending: List[Tuple[int, bytes, asyncio.Future]], output_path: Path) -> bool:
+        """
+        Wait for scheduled page transcodes and write the resulting PDF.
+        
+        Args:
+            pending: (page_number, original image data, transcode future) per page
+            output_path: Path where PDF should be saved
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not pending:
             logger.error("No images to compile")
             return False
 
         try:
-            logger.info(f"Compiling {len(image_data_list)} images into PDF...")
-            
-            # Save images temporarily
-            temp_image_paths = []
-            for idx, img_data in enumerate(image_data_list):
-                temp_path = self.temp_dir / f"page_{idx:04d}.png"
-                with open(temp_path, 'wb') as f:
-                    f.write(img_data)
-                temp_image_paths.append(temp_path)
-
-            # Convert images to RGB if necessary (for PNG with transparency)
-            rgb_image_paths = []
-            for img_path in temp_image_paths:
-                try:
-                    img = Image.open(img_path)
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        # Convert to RGB
-                        rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                        rgb_img.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        rgb_path = img_path.with_suffix('.jpg')
-                        rgb_img.save(rgb_path, 'JPEG', quality=95)
-                        rgb_image_paths.append(rgb_path)
-                    else:
-                        rgb_image_paths.append(img_path)
-                except Exception as e:
-                    logger.warning(f"Error converting image {img_path}: {e}")
-                    rgb_image_paths.append(img_path)
+            logger.info(f"Compiling {len(pending)} images into PDF...")
+
+            results = await asyncio.gather(*(future for _, _, future in pending), return_exceptions=True)
 
-            # Compile to PDF using img2pdf
-            with open(output_path, 'wb') as f:
-                f.write(img2pdf.convert([str(p) for p in rgb_image_paths]))
+            pdf_images = []
+            for (idx, img_data, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error converting image for page {idx}: {result}")
+                    pdf_images.append(img_data)
+                else:
+                    pdf_images.append(result)
+
+            # Compile to PDF using img2pdf in a separate process, so it doesn't
+            # hold this process's GIL while other documents are being captured
+            loop = asyncio.get_running_loop()
+            pool = self._get_process_pool()
+            try:
+                await loop.run_in_executor(pool, compile_pdf_worker, pdf_images, str(output_path))
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a new pool for
+                # later documents instead of failing every remaining compile
+                if self._pool is pool:
+                    pool.shutdown(wait=False)
+                    self._pool = None
+                raise
 
             logger.info(f"PDF compiled successfully: {output_path}")
-            
-            # Clean up temp images
-            for img_path in temp_image_paths + rgb_image_paths:
-                if img_path.exists():
-                    img_path.unlink()
 
             return True
 
@@ -372,13 +605,13 @@ class GoogleDrivePDFDownloader:
             logger.error(f"Error compiling PDF: {e}")
             return False
 
-    async def extract_files_from_folder(self, folder_url: str, browser: Browser) -> Tuple[List[str], str]:
+    async def extract_files_from_folder(self, folder_url: str, context: BrowserContext) -> Tuple[List[str], str]:
         """
         Extract all PDF file links from a Google Drive folder and get folder name.
         
         Args:
             folder_url: Google Drive folder URL
-            browser: Playwright browser instance
+            context: Playwright browser context shared by the batch
             
         Returns:
             Tuple of (file_urls: List[str], folder_name: str)
@@ -387,14 +620,21 @@ class GoogleDrivePDFDownloader:
         folder_name = "gdrive_folder"
         
         try:
-            page = await browser.new_page()
+            page = await context.new_page()
             page.set_default_timeout(self.timeout)
             
+            await page.add_init_script(FOLDER_SCAN_SCRIPT)
+            
             logger.info(f"Opening folder: {folder_url}")
-            await page.goto(folder_url, wait_until='networkidle', timeout=self.timeout)
+            # Drive keeps telemetry connections open, so 'networkidle' rarely fires;
+            # wait for the file rows themselves instead
+            await page.goto(folder_url, wait_until='domcontentloaded', timeout=self.timeout)
             
             # Wait for folder contents to load
-            await asyncio.sleep(3)
+            try:
+                await page.wait_for_selector('[data-id][role="row"], tr[data-id]', timeout=15000)
+            except PlaywrightTimeoutError:
+                logger.warning("Folder rows did not appear within 15s, scanning anyway")
             
             # Try to get folder name from page title
             try:
@@ -411,55 +651,27 @@ class GoogleDrivePDFDownloader:
             
             max_scroll_attempts = 15
             no_new_count = 0
-            collected_file_ids = set()
+            # dict keeps O(1) membership checks and the folder's listing order
+            collected_file_ids: "dict[str, None]" = {}
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
             for attempt in range(100):
                 try:
                     # Extract all file data-ids and names from the current view
                     # Google Drive uses data-id and data attributes in the table rows
-                    file_data = await page.evaluate("""
-                        () => {
-                            let files = [];
-                            
-                            // Look for all rows with data-id attributes (files/folders in the list)
-                            let rows = document.querySelectorAll('[data-id][role="row"], tr[data-id]');
-                            for (let row of rows) {
-                                let fileId = row.getAttribute('data-id');
-                                if (!fileId) continue;
-                                
-                                // Try to find the name within the row
-                                let nameElem = row.querySelector('[data-tooltip]') || row.querySelector('.a65Cwf') || row;
-                                let name = '';
-                                
-                                if (nameElem && nameElem.getAttribute('data-tooltip')) {
-                                    name = nameElem.getAttribute('data-tooltip');
-                                } else {
-                                    name = nameElem ? (nameElem.textContent || '') : '';
-                                }
-                                
-                                // Only include PDFs (check by name ending with .pdf or containing PDF type indicator)
-                                if (name.toLowerCase().includes('.pdf') || 
-                                    row.textContent.toLowerCase().includes('pdf')) {
-                                    files.push({
-                                        id: fileId,
-                                        name: name.trim()
-                                    });
-                                }
-                            }
-                            
-                            return files;
-                        }
-                    """)
+                    file_data = await page.evaluate("() => window.__gddScanFolderFiles()")
                     
                     added = 0
                     for file_data_item in file_data:
                         file_id = file_data_item.get('id')
                         if file_id and file_id not in collected_file_ids:
-                            collected_file_ids.add(file_id)
+                            collected_file_ids[file_id] = None
                             added += 1
-                            logger.debug(f"Found PDF: {file_data_item.get('name', 'Unknown')}")
+                            if debug_enabled:
+                                logger.debug("Found PDF: %s", file_data_item.get('name', 'Unknown'))
                     
-                    logger.debug(f"Folder scan attempt {attempt}: found {len(file_data)} files, total collected {len(collected_file_ids)} (added {added})")
+                    logger.debug("Folder scan attempt %d: found %d files, total collected %d (added %d)",
+                                 attempt, len(file_data), len(collected_file_ids), added)
                     
                     if added == 0:
                         no_new_count += 1
@@ -483,7 +695,7 @@ class GoogleDrivePDFDownloader:
                     await asyncio.sleep(1)
                     
                 except Exception as e:
-                    logger.debug(f"Error during folder scan attempt {attempt}: {e}")
+                    logger.debug("Error during folder scan attempt %d: %s", attempt, e)
                     break
             
             # Convert file IDs to Google Drive file URLs
@@ -504,14 +716,152 @@ class GoogleDrivePDFDownloader:
                 pass
             return [], folder_name
 
-    async def download_pdf(self, drive_url: str, browser: Browser, output_dir: Optional[Path] = None) -> Tuple[bool, str]:
+    def _reserve_output_path(self, output_dir: Path, title: str) -> Path:
+        """
+        Pick an unused PDF path for a title and reserve it.
+        
+        Reservations stop concurrent downloads with the same title from
+        choosing the same file; release them with self._reserved_paths.discard().
+        """
+        sanitized_title = self.sanitize_filename(title)
+        output_path = output_dir / f"{sanitized_title}.pdf"
+
+        # Handle duplicate filenames, including ones claimed by concurrent downloads
+        counter = 1
+        while output_path.exists() or output_path in self._reserved_paths:
+            output_path = output_dir / f"{sanitized_title}_{counter}.pdf"
+            counter += 1
+        self._reserved_paths.add(output_path)
+        return output_path
+
+    async def _get_session(self, context: BrowserContext) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use.
+        
+        The session's cookie jar is seeded from the browser context so direct
+        requests are made with the same Google session as the browser.
+        """
+        if self._session is not None:
+            return self._session
+        # Concurrent downloads all reach this point at once; the lock makes
+        # sure only the first one builds the session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is not None:
+                return self._session
+            cookie_jar = aiohttp.CookieJar()
+            for cookie in await context.cookies():
+                # Keep the domain attribute so '.google.com' cookies are also
+                # sent to drive.google.com and drive.usercontent.google.com
+                morsels = SimpleCookie()
+                morsels[cookie['name']] = cookie['value']
+                morsel = morsels[cookie['name']]
+                morsel['domain'] = cookie['domain']
+                morsel['path'] = cookie.get('path') or '/'
+                if cookie.get('secure'):
+                    morsel['secure'] = True
+                # One call per cookie: same-named cookies on different domains
+                # would overwrite each other in a single SimpleCookie
+                cookie_jar.update_cookies(morsels)
+            # Keep idle connections and DNS answers around between downloads
+            connector = aiohttp.TCPConnector(limit=16, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, cookie_jar=cookie_jar)
+        return self._session
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Return the process pool used for PDF compilation, creating it on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the shared HTTP session and compile pool, if they were opened."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._session_lock = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    async def start(self) -> None:
+        """
+        Launch a browser that stays open across download_multiple calls.
+        
+        The browser is relaunched if it crashed or disconnected, or if the
+        headless setting changed since it was started. Call stop() to close it.
+        """
+        if self._browser is not None and (not self._browser.is_connected()
+                                          or self._browser_headless != self.headless):
+            await self.stop()
+        if self._browser is None:
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            except Exception:
+                # Don't leave a driver running without a browser
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._browser_headless = self.headless
+
+    async def stop(self) -> None:
+        """Close the browser opened by start(), if any."""
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        # A crashed browser or driver may fail to close; drop it either way
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Playwright: {e}")
+
+    async def fetch_direct_pdf(self, file_id: str, context: BrowserContext) -> Optional[Tuple[bytes, str]]:
+        """
+        Try to download the original PDF for files that allow downloading.
+        
+        Args:
+            file_id: Google Drive file ID
+            context: Playwright browser context shared by the batch
+            
+        Returns:
+            Tuple of (pdf_bytes, title), or None if the file is view-only or
+            the request fails
+        """
+        url = f"https://drive.google.com/uc?export=download&id={file_id}"
+        try:
+            session = await self._get_session(context)
+            timeout = aiohttp.ClientTimeout(total=self.timeout / 1000)
+            async with session.get(url, timeout=timeout) as response:
+                # View-only files answer with an HTML page instead of the PDF
+                if response.status != 200 or response.content_type != 'application/pdf':
+                    logger.debug(f"No direct download for {file_id} (HTTP {response.status}, {response.content_type})")
+                    return None
+                disposition = response.content_disposition
+                filename = disposition.filename if disposition and disposition.filename else file_id
+                title = filename[:-4] if filename.lower().endswith('.pdf') else filename
+                return await response.read(), title
+        except Exception as e:
+            logger.debug(f"Direct download failed for {file_id}: {e}")
+            return None
+
+    async def download_pdf(self, drive_url: str, context: BrowserContext, output_dir: Optional[Path] = None,
+                           render_slots: Optional[asyncio.Semaphore] = None) -> Tuple[bool, str]:
         """
         Download a single PDF from Google Drive.
         
         Args:
             drive_url: Google Drive PDF link
-            browser: Playwright browser instance
+            context: Playwright browser context shared by the batch
             output_dir: Optional custom output directory (defaults to self.downloads_dir)
+            render_slots: Optional semaphore limiting how many viewer pages are
+                open at once; direct downloads and compiling don't take a slot
             
         Returns:
             Tuple of (success: bool, message: str)
@@ -526,42 +876,62 @@ class GoogleDrivePDFDownloader:
             else:
                 output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Open new page
-            page = await browser.new_page()
-            page.set_default_timeout(self.timeout)
-
-            # Navigate to the URL
-            logger.info("Loading Google Drive PDF...")
-            await page.goto(drive_url, wait_until='domcontentloaded')
-
-            # Wait for PDF pages to load
-            if not await self.wait_for_pdf_pages(page):
-                return False, "Could not detect PDF pages"
-
-            # Get document title
-            title = await self.get_document_title(page)
-            logger.info(f"Document title: {title}")
-
-            # Capture images
-            image_data_list = await self.capture_blob_images(page)
-            if not image_data_list:
+            # Files with downloads enabled can be fetched as-is, without rendering
+            file_id = self.extract_file_id_from_url(drive_url)
+            direct = await self.fetch_direct_pdf(file_id, context) if file_id else None
+            if direct:
+                pdf_bytes, title = direct
+                logger.info(f"Direct download available: {title}")
+                output_path = self._reserve_output_path(output_dir, title)
+                try:
+                    # Write from a worker thread so other downloads keep running
+                    await asyncio.get_running_loop().run_in_executor(None, output_path.write_bytes, pdf_bytes)
+                finally:
+                    self._reserved_paths.discard(output_path)
+                logger.info(f"[OK] Successfully saved: {output_path}")
+                return True, f"Saved to {output_path}"
+
+            # Render the document in the browser. The page and its slot are
+            # released before compiling, so another document can start
+            # rendering while this one is transcoded and written
+            if render_slots is None:
+                render_slots = asyncio.Semaphore(1)
+            async with render_slots:
+                page = await context.new_page()
+                page.set_default_timeout(self.timeout)
+
+                # Navigate to the URL
+                logger.info("Loading Google Drive PDF...")
+                await page.goto(drive_url, wait_until='domcontentloaded')
+
+                # Wait for PDF pages to load
+                # Give slow connections at least as long as --timeout
+                if not await self.wait_for_pdf_pages(page, timeout=max(20000, self.timeout)):
+                    return False, "Could not detect PDF pages"
+
+                # Get document title
+                title = await self.get_document_title(page)
+                logger.info(f"Document title: {title}")
+
+                # Capture images, transcoding each page while later ones are fetched
+                loop = asyncio.get_running_loop()
+                pending = []
+                async for idx, img_data in self.iter_blob_images(page):
+                    pending.append((idx, img_data, self._schedule_transcode(loop, img_data)))
+
+                await self._close_page(page)
+                page = None
+
+            if not pending:
                 return False, "Failed to capture PDF pages"
 
             # Compile PDF
-            sanitized_title = self.sanitize_filename(title)
-            pdf_filename = f"{sanitized_title}.pdf"
-            output_path = output_dir / pdf_filename
-
-            # Handle duplicate filenames
-            counter = 1
-            base_path = output_path
-            while output_path.exists():
-                pdf_filename = f"{sanitized_title}_{counter}.pdf"
-                output_path = output_dir / pdf_filename
-                counter += 1
-
-            if not await self.compile_pdf(image_data_list, output_path):
-                return False, "Failed to compile PDF"
+            output_path = self._reserve_output_path(output_dir, title)
+            try:
+                if not await self._compile_transcoded(pending, output_path):
+                    return False, "Failed to compile PDF"
+            finally:
+                self._reserved_paths.discard(output_path)
 
             logger.info(f"[OK] Successfully saved: {output_path}")
             return True, f"Saved to {output_path}"
@@ -572,10 +942,31 @@ class GoogleDrivePDFDownloader:
 
         finally:
             if page:
-                try:
-                    await page.close()
-                except Exception as e:
-                    logger.debug(f"Error closing page: {e}")
+                await self._close_page(page)
+
+    async def _close_page(self, page: Page) -> None:
+        """Close a viewer page, logging rather than raising on failure."""
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Error closing page: {e}")
+
+    async def _bounded_download(self, sem: asyncio.Semaphore, limiter: AsyncRateLimiter,
+                                render_slots: asyncio.Semaphore, drive_url: str, context: BrowserContext,
+                                label: str, output_dir: Optional[Path] = None) -> Tuple[bool, str]:
+        """Run download_pdf once a concurrency slot and a rate-limit token are free."""
+        async with sem, limiter:
+            logger.info(f"\n{label}: {drive_url}")
+            return await self.download_pdf(drive_url, context, output_dir=output_dir,
+                                           render_slots=render_slots)
+
+    @staticmethod
+    def _unpack_outcome(outcome) -> Tuple[bool, str]:
+        """Turn a gathered download result, or the exception it raised, into (success, message)."""
+        if isinstance(outcome, BaseException):
+            logger.error(f"Download task failed: {outcome}")
+            return False, f"Error: {outcome}"
+        return outcome
 
     async def download_multiple(self, urls: List[str]) -> None:
         """Download PDFs from multiple URLs, including handling folder links."""
@@ -585,23 +976,59 @@ class GoogleDrivePDFDownloader:
 
         results = {'success': 0, 'failed': 0, 'details': []}
         
-        # Separate folder URLs and file URLs
+        # Separate folder URLs and file URLs; open?id= links are sorted once
+        # the browser can tell which kind they are
         folder_urls = []
         file_urls = []
+        open_urls = []
         
         for url in urls:
             if self.is_folder_url(url):
                 folder_urls.append(url)
             elif self.is_file_url(url):
                 file_urls.append(url)
+            elif self.is_open_url(url):
+                open_urls.append(url)
             else:
                 logger.warning(f"Unrecognized URL format, treating as file URL: {url}")
                 file_urls.append(url)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
+        async with AsyncExitStack() as stack:
+            # Reuse the browser kept open by start(), otherwise launch one for this batch
+            browser = self._browser
+            if browser is None:
+                p = await stack.enter_async_context(async_playwright())
+                browser = await p.chromium.launch(headless=self.headless)
+                stack.push_async_callback(browser.close)
+            # One context for the whole batch so Drive's cookies and cached
+            # assets are shared between pages
+            context = None
+            if self.STORAGE_STATE_FILE.exists():
+                try:
+                    context = await browser.new_context(storage_state=self.STORAGE_STATE_FILE)
+                except Exception as e:
+                    # A truncated or corrupt state file shouldn't block every batch
+                    logger.warning(f"Ignoring unreadable browser state {self.STORAGE_STATE_FILE}: {e}")
+            if context is None:
+                context = await browser.new_context()
+            # Limits how many viewer pages render at the same time
+            render_slots = asyncio.Semaphore(self.concurrency)
+            # Limits how many PDFs are in flight; twice the render slots so
+            # direct fetches and compiles overlap with rendering
+            sem = asyncio.Semaphore(self.concurrency * 2)
+            # Paces download starts so bursts stay under Drive's rate limits
+            limiter = AsyncRateLimiter(self.max_rate)
             
             try:
+                # Sort open?id= links into folders and files by following them
+                if open_urls:
+                    async def resolve(url):
+                        async with render_slots:
+                            return await self.resolve_open_url(url, context)
+
+                    for url in await asyncio.gather(*(resolve(url) for url in open_urls)):
+                        (folder_urls if self.is_folder_url(url) else file_urls).append(url)
+
                 # Process folders first
                 if folder_urls:
                     logger.info(f"\n{'='*60}")
@@ -614,7 +1041,7 @@ class GoogleDrivePDFDownloader:
                         logger.info(f"{'='*60}")
                         
                         # Extract files from folder
-                        extracted_files, folder_name = await self.extract_files_from_folder(folder_url, browser)
+                        extracted_files, folder_name = await self.extract_files_from_folder(folder_url, context)
                         
                         if not extracted_files:
                             logger.warning(f"No files found in folder: {folder_url}")
@@ -627,38 +1054,35 @@ class GoogleDrivePDFDownloader:
                         folder_output_dir.mkdir(parents=True, exist_ok=True)
                         logger.info(f"Created local folder: {folder_output_dir}")
                         
-                        # Download each file in the folder
-                        for file_idx, file_url in enumerate(extracted_files, 1):
-                            logger.info(f"\n  File {file_idx}/{len(extracted_files)}")
-                            success, message = await self.download_pdf(file_url, browser, output_dir=folder_output_dir)
-                            
+                        # Download the files in the folder concurrently
+                        outcomes = await asyncio.gather(*(
+                            self._bounded_download(sem, limiter, render_slots, file_url, context, f"  File {file_idx}/{len(extracted_files)}",
+                                                   output_dir=folder_output_dir)
+                            for file_idx, file_url in enumerate(extracted_files, 1)
+                        ), return_exceptions=True)
+                        
+                        for file_url, outcome in zip(extracted_files, outcomes):
+                            success, message = self._unpack_outcome(outcome)
                             if success:
                                 results['success'] += 1
                             else:
                                 results['failed'] += 1
                             
                             results['details'].append({'url': file_url, 'status': 'SUCCESS' if success else 'FAILED', 'message': message})
-                            
-                            # Small delay between downloads
-                            await asyncio.sleep(1)
-                        
-                        # Small delay between folders
-                        await asyncio.sleep(2)
                 
                 # Process individual files
                 if file_urls:
-                    total_files = len(folder_urls) + len(file_urls)
                     logger.info(f"\n{'='*60}")
                     logger.info(f"Processing {len(file_urls)} file(s)")
                     logger.info(f"{'='*60}")
                     
-                    for file_idx, file_url in enumerate(file_urls, 1):
-                        logger.info(f"\n{'='*60}")
-                        logger.info(f"File {file_idx}/{len(file_urls)}")
-                        logger.info(f"{'='*60}")
-                        
-                        success, message = await self.download_pdf(file_url, browser)
-                        
+                    outcomes = await asyncio.gather(*(
+                        self._bounded_download(sem, limiter, render_slots, file_url, context, f"File {file_idx}/{len(file_urls)}")
+                        for file_idx, file_url in enumerate(file_urls, 1)
+                    ), return_exceptions=True)
+                    
+                    for file_url, outcome in zip(file_urls, outcomes):
+                        success, message = self._unpack_outcome(outcome)
                         if success:
                             results['success'] += 1
                             results['details'].append({'url': file_url, 'status': 'SUCCESS', 'message': message})
@@ -666,12 +1090,13 @@ class GoogleDrivePDFDownloader:
                             results['failed'] += 1
                             results['details'].append({'url': file_url, 'status': 'FAILED', 'message': message})
 
-                        # Small delay between downloads
-                        if file_idx < len(file_urls):
-                            await asyncio.sleep(2)
-
             finally:
-                await browser.close()
+                await self.close()
+                try:
+                    await context.storage_state(path=self.STORAGE_STATE_FILE)
+                except Exception as e:
+                    logger.debug(f"Could not save browser state: {e}")
+                await context.close()
 
         # Print summary
         logger.info(f"\n{'='*60}")
@@ -687,33 +1112,38 @@ class GoogleDrivePDFDownloader:
             logger.info(f"{status_icon} {detail['url']}")
             logger.info(f"  {detail['message']}")
 
-    def load_urls_from_file(self, file_path: str) -> List[str]:
-        """Load URLs from a text or CSV file."""
-        urls = []
+    def load_urls_from_file(self, file_path: str) -> Iterator[str]:
+        """
+        Load URLs from a text or CSV file.
+        
+        URLs are yielded as the file is read, so large link lists are never
+        held in memory as a whole.
+        """
+        count = 0
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
                 # Check if it's a CSV file
                 if file_path.lower().endswith('.csv'):
-                    reader = csv.reader(f)
-                    for row in reader:
-                        if row and row[0].strip().startswith('http'):
-                            urls.append(row[0].strip())
+                    lines = (row[0] for row in csv.reader(f) if row)
                 else:
                     # Treat as plain text file
-                    for line in f:
-                        line = line.strip()
-                        if line and line.startswith('http'):
-                            urls.append(line)
-
-            logger.info(f"Loaded {len(urls)} URLs from {file_path}")
-            return urls
+                    lines = f
+                # Blank lines, '#' comments and non-link text such as a CSV
+                # header are skipped quietly; links we can't handle are reported
+                for line in lines:
+                    line = line.strip()
+                    if DRIVE_URL_RE.match(line):
+                        count += 1
+                        yield line
+                    elif line and not line.startswith('#') and ('://' in line or 'drive.google.com' in line):
+                        logger.warning(f"Skipping unsupported link: {line}")
+
+            logger.info(f"Loaded {count} URLs from {file_path}")
 
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
-            return []
         except Exception as e:
             logger.error(f"Error loading URLs from file: {e}")
-            return []
 
 
 def main():
@@ -760,6 +1190,18 @@ Examples:
         default=30,
         help='Page load timeout in seconds (default: 30)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Number of PDFs rendered in the browser at the same time (default: 4)'
+    )
+    parser.add_argument(
+        '--max-rate',
+        type=float,
+        default=8.0,
+        help='Maximum number of downloads started per second, fractions allowed (default: 8)'
+    )
 
     args = parser.parse_args()
 
@@ -767,9 +1209,12 @@ Examples:
     if not args.link and not args.file:
         parser.print_help()
         sys.exit(1)
+    if args.max_rate <= 0:
+        parser.error("--max-rate must be greater than 0")
 
     # Initialize downloader
-    downloader = GoogleDrivePDFDownloader(headless=args.headless, timeout=args.timeout)
+    downloader = GoogleDrivePDFDownloader(headless=args.headless, timeout=args.timeout,
+                                          concurrency=args.concurrency, max_rate=args.max_rate)
 
     # Prepare URLs
     urls = []
@@ -4,10 +4,111 @@ This script can be run without command-line arguments for interactive mode.
 """
 
 import os
+import stat
 import sys
-import asyncio
 from pathlib import Path
 
+# asyncio, threading and the downloader module (Playwright, aiohttp, Pillow,
+# img2pdf) are imported only by the menu options that need them
+
+# Bytes-to-megabytes factor for the downloads listing
+MB = 1.0 / (1024 * 1024)
+
+# Downloader shared by every menu job, created on first use
+_downloader = None
+
+# Event loop running in a background thread; every job is submitted to it so
+# the downloader's browser stays alive between jobs
+_loop = None
+_loop_thread = None
+
+
+def submit_job(coro):
+    """Schedule a coroutine on the shared background loop and return its future."""
+    import asyncio
+    import threading
+
+    global _loop, _loop_thread
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        _loop_thread = threading.Thread(target=_loop.run_forever, daemon=True)
+        _loop_thread.start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
+
+
+def run_job(coro):
+    """Run a coroutine on the shared background loop and wait for its result."""
+    return submit_job(coro).result()
+
+
+async def download(downloader, urls):
+    """Download URLs with the downloader's long-lived browser."""
+    await downloader.start()
+    await downloader.download_multiple(urls)
+
+
+def run_download(downloader, urls):
+    """Run a download job, reporting failures instead of leaving the menu."""
+    future = submit_job(download(downloader, urls))
+    try:
+        future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        print("\nDownload cancelled.")
+    except Exception as e:
+        print(f"\nDownload failed: {e}")
+
+
+# Handle on the downloads folder, kept open between listings on platforms
+# that support stat() relative to a directory fd
+_downloads_fd = None
+USE_DIR_FD = hasattr(os, 'O_DIRECTORY') and os.stat in os.supports_dir_fd
+
+
+def get_downloads_fd():
+    """Return the cached downloads-folder fd, reopening it if the folder was replaced."""
+    global _downloads_fd
+    if _downloads_fd is not None:
+        cached, current = os.fstat(_downloads_fd), os.stat("downloads")
+        if (cached.st_dev, cached.st_ino) != (current.st_dev, current.st_ino):
+            os.close(_downloads_fd)
+            _downloads_fd = None
+    if _downloads_fd is None:
+        _downloads_fd = os.open("downloads", os.O_RDONLY | os.O_DIRECTORY)
+    return _downloads_fd
+
+
+def shutdown():
+    """Close the shared browser and downloads-folder handle, and stop the background loop."""
+    global _downloads_fd, _loop, _loop_thread
+    if _downloads_fd is not None:
+        os.close(_downloads_fd)
+        _downloads_fd = None
+    if _loop is not None:
+        try:
+            if _downloader is not None:
+                run_job(_downloader.stop())
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+        finally:
+            _loop.call_soon_threadsafe(_loop.stop)
+            _loop_thread.join()
+            _loop.close()
+            _loop = _loop_thread = None
+
+
+def get_downloader(headless=False, timeout=30):
+    """Return the shared downloader, configured for the next job."""
+    from gddown import GoogleDrivePDFDownloader
+
+    global _downloader
+    if _downloader is None:
+        _downloader = GoogleDrivePDFDownloader(headless=headless, timeout=timeout)
+    else:
+        _downloader.headless = headless
+        _downloader.timeout = timeout * 1000  # Playwright uses milliseconds
+    return _downloader
+
 
 def interactive_mode():
     """Interactive menu for downloading PDFs."""
@@ -28,26 +129,28 @@ def interactive_mode():
         choice = input("Select option (1-6): ").strip()
 
         if choice == '1':
+            from gddown import DRIVE_URL_RE
             url = input("\nEnter Google Drive PDF link: ").strip()
-            if url.startswith('http'):
+            if DRIVE_URL_RE.match(url):
                 headless = input("Run in headless mode? (y/n): ").strip().lower() == 'y'
                 timeout = input("Timeout in seconds (default 30): ").strip()
-                timeout_arg = f"--timeout {timeout}" if timeout.isdigit() else ""
-                headless_arg = "--headless" if headless else ""
-                cmd = f"python gdrive_pdf_downloader.py --link \"{url}\" {headless_arg} {timeout_arg}".strip()
-                print(f"\nRunning: {cmd}\n")
-                os.system(cmd)
+                print(f"\nDownloading: {url}\n")
+                downloader = get_downloader(headless, int(timeout) if timeout.isdigit() else 30)
+                run_download(downloader, [url])
             else:
-                print("Invalid URL!")
+                print("Invalid Google Drive URL!")
 
         elif choice == '2':
             filename = input("\nEnter text filename (default 'links.txt'): ").strip() or "links.txt"
             if Path(filename).exists():
                 headless = input("Run in headless mode? (y/n): ").strip().lower() == 'y'
-                headless_arg = "--headless" if headless else ""
-                cmd = f"python gdrive_pdf_downloader.py --file {filename} {headless_arg}".strip()
-                print(f"\nRunning: {cmd}\n")
-                os.system(cmd)
+                downloader = get_downloader(headless)
+                urls = list(downloader.load_urls_from_file(filename))
+                if urls:
+                    print(f"\nDownloading {len(urls)} link(s) from {filename}\n")
+                    run_download(downloader, urls)
+                else:
+                    print(f"No valid links found in '{filename}'!")
             else:
                 print(f"File '{filename}' not found!")
 
@@ -55,10 +158,13 @@ def interactive_mode():
             filename = input("\nEnter CSV filename (default 'links.csv'): ").strip() or "links.csv"
             if Path(filename).exists():
                 headless = input("Run in headless mode? (y/n): ").strip().lower() == 'y'
-                headless_arg = "--headless" if headless else ""
-                cmd = f"python gdrive_pdf_downloader.py --file {filename} {headless_arg}".strip()
-                print(f"\nRunning: {cmd}\n")
-                os.system(cmd)
+                downloader = get_downloader(headless)
+                urls = list(downloader.load_urls_from_file(filename))
+                if urls:
+                    print(f"\nDownloading {len(urls)} link(s) from {filename}\n")
+                    run_download(downloader, urls)
+                else:
+                    print(f"No valid links found in '{filename}'!")
             else:
                 print(f"File '{filename}' not found!")
 
@@ -69,6 +175,7 @@ def interactive_mode():
             check_downloads()
 
         elif choice == '6':
+            shutdown()
             print("\nGoodbye!")
             break
 
@@ -101,23 +208,35 @@ def check_downloads():
         print("\nDownloads folder does not exist yet.")
         return
     
-    pdfs = list(downloads_dir.glob("*.pdf"))
+    # Collect (name, size) pairs with a single stat per PDF
+    if USE_DIR_FD:
+        fd = get_downloads_fd()
+        pdfs = []
+        for name in os.listdir(fd):
+            if name.endswith('.pdf'):
+                st = os.stat(name, dir_fd=fd, follow_symlinks=False)
+                if stat.S_ISREG(st.st_mode):
+                    pdfs.append((name, st.st_size))
+    else:
+        # scandir entries cache their stat result
+        with os.scandir(downloads_dir) as it:
+            pdfs = [(e.name, e.stat().st_size) for e in it
+                    if e.is_file(follow_symlinks=False) and e.name.endswith('.pdf')]
     
     if not pdfs:
         print("\nNo PDFs in downloads folder yet.")
         return
     
     print(f"\nFound {len(pdfs)} PDF(s) in downloads folder:\n")
-    total_size = 0
+    total_size = sum(size for _, size in pdfs)
     
-    for idx, pdf in enumerate(pdfs, 1):
-        size_mb = pdf.stat().st_size / (1024 * 1024)
-        total_size += pdf.stat().st_size
-        print(f"{idx}. {pdf.name}")
-        print(f"   Size: {size_mb:.2f} MB")
-        print()
+    def lines():
+        for idx, (name, size) in enumerate(pdfs, 1):
+            yield "%d. %s\n   Size: %.2f MB\n\n" % (idx, name, size * MB)
+        yield "Total size: %.2f MB\n" % (total_size * MB)
     
-    print(f"Total size: {total_size / (1024 * 1024):.2f} MB")
+    # One writelines call for the whole listing, without building one big string
+    sys.stdout.writelines(lines())
 
 
 if __name__ == '__main__':
@@ -3,16 +3,76 @@ Verification and testing script for Google Drive PDF Downloader.
 This script checks if all dependencies are correctly installed.
 """
 
+import io
 import sys
-import subprocess
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Importable packages the downloader needs, with what each is used for
+REQUIRED_PACKAGES = (
+    ('playwright', 'Browser automation'),
+    ('PIL', 'Image processing (Pillow)'),
+    ('img2pdf', 'PDF compilation'),
+    ('aiohttp', 'Async HTTP requests'),
+)
+
+# Check that must pass before each of these is worth running (by default)
+PREREQUISITES = {
+    'Dependencies': 'Python Version',
+    'Playwright Browsers': 'Dependencies',
+    'Project Files': 'Python Version',
+    'Directories': 'Python Version',
+}
+
+# Section banners, built once at import
+SEP = "=" * 60
+BANNER_PYTHON = f"\n{SEP}\nChecking Python Version\n{SEP}"
+BANNER_DEPS = f"\n{SEP}\nChecking Dependencies\n{SEP}"
+BANNER_PLAYWRIGHT = f"\n{SEP}\nChecking Playwright Browsers\n{SEP}"
+BANNER_FILES = f"\n{SEP}\nChecking Project Files\n{SEP}"
+BANNER_DIRS = f"\n{SEP}\nChecking Directories\n{SEP}"
+BANNER_SYSTEM = f"\n{SEP}\nSystem Information\n{SEP}"
+BANNER_SUMMARY = f"\n{SEP}\nSummary\n{SEP}"
+HEADER = "\n".join([
+    "\n",
+    "╔" + "=" * 58 + "╗",
+    "║" + " " * 58 + "║",
+    "║" + "  Google Drive PDF Downloader - Setup Verification".center(58) + "║",
+    "║" + " " * 58 + "║",
+    "╚" + "=" * 58 + "╝",
+])
+
+
+class BufferedStdout:
+    """Stdout stand-in that sends each worker thread's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, 'buffer', None) or self.stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def capture(self, check):
+        """Run a check in the current thread, returning (result, printed output)."""
+        self._local.buffer = io.StringIO()
+        try:
+            return check(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
 
 def check_python_version():
     """Check if Python version is 3.8 or higher."""
-    print("\n" + "="*60)
-    print("Checking Python Version")
-    print("="*60)
+    print(BANNER_PYTHON)
     
     version = sys.version_info
     version_str = f"{version.major}.{version.minor}.{version.micro}"
@@ -28,28 +88,15 @@ def check_python_version():
 
 def check_dependencies():
     """Check if all required packages are installed."""
-    print("\n" + "="*60)
-    print("Checking Dependencies")
-    print("="*60)
-    
-    required_packages = {
-        'playwright': 'Browser automation',
-        'PIL': 'Image processing (Pillow)',
-        'img2pdf': 'PDF compilation',
-        'aiohttp': 'Async HTTP requests',
-    }
+    print(BANNER_DEPS)
     
     all_ok = True
     
-    for package, description in required_packages.items():
-        try:
-            if package == 'PIL':
-                import PIL
-                print(f"✓ {package:15} - {description}")
-            else:
-                __import__(package)
-                print(f"✓ {package:15} - {description}")
-        except ImportError:
+    for package, description in REQUIRED_PACKAGES:
+        # Locate the package without importing (and executing) it
+        if importlib.util.find_spec(package) is not None:
+            print(f"✓ {package:15} - {description}")
+        else:
             print(f"❌ {package:15} - {description} (NOT INSTALLED)")
             all_ok = False
     
@@ -63,49 +110,36 @@ def check_dependencies():
 
 def check_playwright_browsers():
     """Check if Playwright browsers are installed."""
-    print("\n" + "="*60)
-    print("Checking Playwright Browsers")
-    print("="*60)
+    print(BANNER_PLAYWRIGHT)
     
-    try:
-        from playwright.async_api import async_playwright
-        print("✓ Playwright module found")
-        
-        # Check for browser executables
-        browsers_to_check = ['chromium', 'firefox', 'webkit']
-        
-        # Try to get browser paths
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'playwright', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                print(f"✓ Playwright CLI: {result.stdout.strip()}")
-            else:
-                print("⚠ Could not verify Playwright CLI version")
-        except Exception as e:
-            print(f"⚠ Could not check Playwright CLI: {e}")
-        
-        print("\nTo install browsers, run:")
-        print("  playwright install chromium")
-        print("  # or")
-        print("  playwright install")
-        
-        return True
-        
-    except ImportError:
+    if importlib.util.find_spec('playwright') is None:
         print("❌ Playwright not installed")
         return False
+    
+    print("✓ Playwright module found")
+    
+    from importlib.metadata import version, PackageNotFoundError
+    
+    # Check for browser executables
+    browsers_to_check = ['chromium', 'firefox', 'webkit']
+    
+    # Read the version from the installed package metadata
+    try:
+        print(f"✓ Playwright: {version('playwright')}")
+    except PackageNotFoundError:
+        print("⚠ Could not verify Playwright version")
+    
+    print("\nTo install browsers, run:")
+    print("  playwright install chromium")
+    print("  # or")
+    print("  playwright install")
+    
+    return True
 
 
 def check_project_files():
     """Check if essential project files exist."""
-    print("\n" + "="*60)
-    print("Checking Project Files")
-    print("="*60)
+    print(BANNER_FILES)
     
     files_to_check = {
         'gdrive_pdf_downloader.py': 'Main script',
@@ -127,13 +161,10 @@ def check_project_files():
 
 def check_directories():
     """Check/create necessary directories."""
-    print("\n" + "="*60)
-    print("Checking Directories")
-    print("="*60)
+    print(BANNER_DIRS)
     
     directories = {
         'downloads': 'Output directory for PDFs',
-        'temp_images': 'Temporary image storage',
     }
     
     for dirname, description in directories.items():
@@ -153,47 +184,78 @@ def check_directories():
 
 def check_system():
     """Check system information."""
-    print("\n" + "="*60)
-    print("System Information")
-    print("="*60)
+    print(BANNER_SYSTEM)
     
     import platform
     
-    print(f"OS: {platform.system()} {platform.release()}")
-    print(f"Architecture: {platform.machine()}")
+    # uname() returns system, release and machine from a single lookup
+    uname = platform.uname()
+    print(f"OS: {uname.system} {uname.release}")
+    print(f"Architecture: {uname.machine}")
     print(f"Python: {sys.version}")
     print(f"Working directory: {Path.cwd()}")
 
 
-def run_all_checks():
-    """Run all verification checks."""
-    print("\n")
-    print("╔" + "="*58 + "╗")
-    print("║" + " "*58 + "║")
-    print("║" + "  Google Drive PDF Downloader - Setup Verification".center(58) + "║")
-    print("║" + " "*58 + "║")
-    print("╚" + "="*58 + "╝")
+def run_all_checks(full=False):
+    """
+    Run all verification checks.
     
-    check_system()
+    Args:
+        full: Report every check even when a prerequisite failed; by default
+            checks that depend on a failed one are skipped
+    """
+    print(HEADER)
     
-    results = {
-        'Python Version': check_python_version(),
-        'Dependencies': check_dependencies(),
-        'Playwright Browsers': check_playwright_browsers(),
-        'Project Files': check_project_files(),
-        'Directories': check_directories(),
+    checks = {
+        'Python Version': check_python_version,
+        'Dependencies': check_dependencies,
+        'Playwright Browsers': check_playwright_browsers,
+        'Project Files': check_project_files,
+        'Directories': check_directories,
     }
     
+    # Checks run side by side; a check whose prerequisite must pass first is
+    # only submitted once it has. Each one's output is buffered and printed
+    # in the usual order
+    results = {}
+    futures = {}
+    stdout = BufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks) + 1) as pool:
+            def submit_ready():
+                for name, check in checks.items():
+                    prerequisite = PREREQUISITES.get(name)
+                    if name not in futures and (full or prerequisite is None or results.get(prerequisite)):
+                        futures[name] = pool.submit(stdout.capture, check)
+            
+            system_future = pool.submit(stdout.capture, check_system)
+            submit_ready()
+            sys.stdout.write(system_future.result()[1])
+            
+            for name in checks:
+                # Never submitted: its prerequisite failed or was skipped
+                if name not in futures:
+                    results[name] = None
+                    continue
+                result, output = futures[name].result()
+                sys.stdout.write(output)
+                results[name] = result
+                submit_ready()
+    finally:
+        sys.stdout = stdout.stream
+    
     # Summary
-    print("\n" + "="*60)
-    print("Summary")
-    print("="*60)
+    print(BANNER_SUMMARY)
     
     passed = sum(1 for v in results.values() if v)
     total = len(results)
     
     for check_name, result in results.items():
-        status = "✓ PASS" if result else "❌ FAIL"
+        if result is None:
+            status = "- SKIPPED"
+        else:
+            status = "✓ PASS" if result else "❌ FAIL"
         print(f"{check_name:30} {status}")
     
     print(f"\nPassed: {passed}/{total}")
@@ -209,5 +271,15 @@ def run_all_checks():
 
 
 if __name__ == '__main__':
-    success = run_all_checks()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Verify the Google Drive PDF Downloader setup')
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Run every check even if an earlier one fails'
+    )
+    args = parser.parse_args()
+    
+    success = run_all_checks(full=args.full)
     sys.exit(0 if success else 1)